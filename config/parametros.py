@@ -3,6 +3,8 @@ Parámetros del Lago Titicaca basados en estudios reales para un modelo hidroló
 Ajustados para evitar dinámica explosiva o reducción instantánea.
 """
 
+import functools
+
 # ================================
 # PARÁMETROS PRINCIPALES
 # ================================
@@ -63,34 +65,78 @@ PARAMETROS_ADICIONALES = {
 # Mezcla final
 PARAMETROS_DEFAULT = {**PARAMETROS_INICIALES, **PARAMETROS_ADICIONALES}
 
+# ================================
+# VARIANTES DEL JUEGO DE PARÁMETROS
+# ================================
+# Única fuente de verdad para las variantes que antes circulaban como copias
+# sueltas del módulo: cada preset es un conjunto de overrides sobre la base.
+PRESETS = {
+    # Valores ajustados actuales (sin overrides)
+    'ajustado': {},
+
+    # Dinámica biológica previa al ajuste (los valores "antes" anotados arriba)
+    'original': {
+        'tasa_crecimiento_lemna': 1.2,
+        'tasa_mortalidad_lemna': 1.0,
+        'tasa_sedimentacion_nutrientes': 0.25,
+        'tasa_dilution_natural': 0.03,
+    },
+}
+
 # ================================
 # VALIDACIÓN DE PARÁMETROS
 # ================================
+# Tabla construida una sola vez a nivel de módulo: validar_parametros corre
+# en cada obtener_parametros y no debe reconstruir el dict en cada llamada.
+_VALIDACIONES = (
+    ('volumen_inicial', 5e11, 1.2e12, "Volumen debe estar entre 500–1200 km³"),
+    ('nutrientes_inicial', 0.001, 1.0, "Nutrientes deben estar entre 0.001–1.0 mg/L"),
+    ('lemna_inicial', 0, 5000, "Biomasa debe estar entre 0–5000 ton"),
+    ('oxigeno_inicial', 0, 12, "Oxígeno debe estar entre 0–12 mg/L"),
+    ('tiempo_simulacion', 0, 200, "Tiempo de simulación debe estar entre 0–200 años"),
+)
+
+
 def validar_parametros(params):
-    validaciones = {
-        'volumen_inicial': (5e11, 1.2e12, "Volumen debe estar entre 500–1200 km³"),
-        'nutrientes_inicial': (0.001, 1.0, "Nutrientes deben estar entre 0.001–1.0 mg/L"),
-        'lemna_inicial': (0, 5000, "Biomasa debe estar entre 0–5000 ton"),
-        'oxigeno_inicial': (0, 12, "Oxígeno debe estar entre 0–12 mg/L"),
-        'tiempo_simulacion': (0, 200, "Tiempo de simulación debe estar entre 0–200 años"),
-    }
-
-    for param, (min_val, max_val, mensaje) in validaciones.items():
-        if param in params:
-            valor = params[param]
-            if not (min_val <= valor <= max_val):
-                raise ValueError(f"{mensaje}. Valor recibido: {valor}")
+    for param, min_val, max_val, mensaje in _VALIDACIONES:
+        valor = params.get(param)
+        if valor is not None and not (min_val <= valor <= max_val):
+            raise ValueError(f"{mensaje}. Valor recibido: {valor}")
 
     return True
 
 # ================================
 # FUNCIÓN PARA OBTENER PARÁMETROS
 # ================================
-def obtener_parametros(modificaciones=None):
+@functools.lru_cache(maxsize=128)
+def _obtener_parametros_congelados(preset, mods_congeladas):
+    """Mezcla y valida una sola vez por combinación (preset, modificaciones)."""
     params = PARAMETROS_DEFAULT.copy()
+    params.update(PRESETS[preset])
 
-    if modificaciones:
-        params.update(modificaciones)
+    if mods_congeladas:
+        params.update(mods_congeladas)
 
     validar_parametros(params)
-    return params
+    return tuple(params.items())
+
+
+def obtener_parametros(modificaciones=None, preset='ajustado'):
+    if preset not in PRESETS:
+        raise ValueError(f"Preset '{preset}' no encontrado. "
+                        f"Presets disponibles: {list(PRESETS.keys())}")
+
+    # En barridos de escenarios esta función se llama cientos de veces con
+    # las mismas modificaciones; la mezcla + validación se memoiza y aquí
+    # solo se materializa una copia mutable para el llamador.
+    try:
+        mods = frozenset(modificaciones.items()) if modificaciones else frozenset()
+        return dict(_obtener_parametros_congelados(preset, mods))
+    except TypeError:
+        # Valores no hasheables: ruta sin caché
+        params = PARAMETROS_DEFAULT.copy()
+        params.update(PRESETS[preset])
+        if modificaciones:
+            params.update(modificaciones)
+        validar_parametros(params)
+        return params
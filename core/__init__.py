@@ -15,8 +15,15 @@ Crear estos archivos en cada directorio:
 Módulo central con el modelo de simulación.
 """
 
-from .modelo import ModeloTiticaca
-
 __all__ = ['ModeloTiticaca']
 
 
+def __getattr__(name):
+    # Import perezoso (PEP 562): importar `core` no debe arrastrar numpy
+    # cuando solo se usan config.parametros / config.escenarios.
+    if name == 'ModeloTiticaca':
+        from .modelo import ModeloTiticaca
+        return ModeloTiticaca
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
@@ -0,0 +1,237 @@
+"""
+Lado derecho (RHS) del sistema de EDOs compilado con Numba.
+
+`ModeloTiticaca.ecuaciones` se invoca cientos o miles de veces por simulación;
+cada llamada en Python puro paga búsquedas de atributos, `.get` sobre
+diccionarios y la construcción de un `np.array` nuevo. Aquí el RHS se
+reescribe como función a nivel de módulo, compilada con `@njit`, que recibe
+los parámetros empacados en un vector plano `float64` (ver índices abajo).
+
+Si Numba no está instalado, el decorador se sustituye por una identidad y la
+función se ejecuta en Python puro con la misma semántica.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_DISPONIBLE = True
+except ImportError:  # pragma: no cover - entorno sin numba
+    NUMBA_DISPONIBLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorador(func):
+            return func
+        return decorador
+
+
+# ================================
+# LAYOUT DEL VECTOR DE PARÁMETROS
+# ================================
+# Orden fijo de los escalares dentro del vector `p` que recibe `rhs`.
+# Los tres primeros son agregados invariantes del escenario, precalculados
+# una sola vez en ModeloTiticaca.__init__ (no dependen de y ni de t):
+IDX_Q_IN = 0                 # entrada de agua: area*precipitacion + rios (m³/año)
+IDX_Q_OUT = 1                # salida de agua: area*evaporacion + extraccion (m³/año)
+IDX_CARGA = 2                # descarga neta de fósforo con tratamiento (ton/año)
+IDX_TASA_SED = 3             # tasa_sedimentacion_nutrientes (1/año)
+IDX_TASA_ABS = 4             # tasa_absorcion_nutrientes_lemna
+IDX_KM_ABS = 5               # km_absorcion_lemna (mg/L)
+IDX_NUTR_OPT = 6             # nutrientes_optimo_lemna (mg/L)
+IDX_TASA_CREC = 7            # tasa_crecimiento_lemna (1/año)
+IDX_TASA_MORT = 8            # tasa_mortalidad_lemna (1/año)
+IDX_CAPACIDAD = 9            # capacidad_carga_lemna (ton)
+IDX_O2_SAT = 10              # oxigeno_saturacion (mg/L)
+IDX_TASA_REOX = 11           # tasa_reoxigenacion (1/año)
+IDX_CONS_O2_DESC = 12        # consumo_o2_descomposicion
+IDX_REMOCION = 13            # remocion_mecanica_lemna (ton/año)
+IDX_UMBRAL_SAT = 14          # umbral de saturación de Lemna (0-1)
+
+N_PARAMS = 15
+
+# ================================
+# CONSTANTES DEL SUBMODELO DE OXÍGENO
+# ================================
+# A nivel de módulo para que Numba las congele como literales al compilar
+# (un global leído dentro de @njit se trata como constante) y para que el
+# resto del paquete no repita números mágicos.
+UMBRAL_SATURACION = 0.95   # fracción de capacidad donde la Lemna satura
+K_PROD_O2 = 0.05           # producción fotosintética por ton de Lemna
+K_CONS_O2_LOW = 0.001      # respiración con superficie despejada
+K_CONS_O2_HIGH = 0.01      # respiración bajo saturación
+ANCHO_BLOQUEO = 0.05       # ventana de pct sobre el umbral que cierra el intercambio
+
+
+@njit(cache=True, fastmath=True)
+def rhs(t, y, p):
+    """
+    Derivadas del sistema [volumen, nutrientes, lemna, oxigeno].
+
+    Réplica exacta de `ModeloTiticaca.ecuaciones` con los cuerpos de
+    `flujo_entrada_agua`, `flujo_salida_agua`, `descarga_contaminantes`,
+    `crecimiento_lemna`, `consumo_nutrientes_lemna` y `dinamica_oxigeno`
+    expandidos en línea sobre escalares.
+
+    Args:
+        t (float): Tiempo (años). El sistema es autónomo pero los
+            integradores exigen la firma (t, y).
+        y (ndarray): Estado [volumen_m3, nutrientes_mgL, lemna_ton, oxigeno_mgL]
+        p (ndarray): Vector de parámetros float64 según los índices IDX_*
+
+    Returns:
+        ndarray: Derivadas [dV_dt, dN_dt, dL_dt, dO_dt]
+    """
+    volumen_m3 = max(y[0], 1.0)
+    nutrientes_mgL = max(y[1], 0.0)
+    lemna_ton = max(y[2], 0.0)
+    oxigeno_mgL = max(y[3], 0.0)
+
+    umbral = p[IDX_UMBRAL_SAT]
+
+    # --- Volumen ---
+    dV_dt = p[IDX_Q_IN] - p[IDX_Q_OUT]
+
+    # --- Nutrientes ---
+    carga_conc = (p[IDX_CARGA] * 1e6) / volumen_m3
+
+    # Sin ramas: los tramos de cada función por partes se calculan siempre y
+    # se combinan con máscaras 0/1. El flujo de control uniforme deja que el
+    # compilador emita selects/cmov y vectorice dentro del RK4.
+    capacidad = p[IDX_CAPACIDAD]
+    pct = lemna_ton / max(capacidad, 1e-30) * (capacidad > 0.0)
+
+    # Consumo de nutrientes (0 si lemna<=1 ton o lemna>=umbral de capacidad)
+    factor_saturacion = nutrientes_mgL / (nutrientes_mgL + p[IDX_KM_ABS])
+    bajo_medio = pct < 0.5
+    factor_eficiencia = (bajo_medio * (pct * 2.0)
+                         + (1.0 - bajo_medio) * ((umbral - pct) / (umbral - 0.5)))
+    factor_eficiencia = max(0.0, min(1.0, factor_eficiencia))
+
+    absorcion_ton = p[IDX_TASA_ABS] * lemna_ton * factor_saturacion * factor_eficiencia
+    consumo_lemna = (absorcion_ton * 1e9) / (volumen_m3 * 1000.0)
+    consumo_lemna = max(0.0, min(consumo_lemna, nutrientes_mgL * 0.1))
+    consumo_activo = (lemna_ton > 1.0) * (nutrientes_mgL > 0.0) * (pct < umbral)
+    consumo_lemna = consumo_lemna * consumo_activo
+
+    sedimentacion = p[IDX_TASA_SED] * nutrientes_mgL
+    dilucion = -nutrientes_mgL * (dV_dt / volumen_m3)
+
+    dN_dt = carga_conc - consumo_lemna - sedimentacion + dilucion
+
+    # --- Lemna ---
+    # Con lemna_ton == 0 el crecimiento neto ya es 0; no necesita máscara.
+    Km = p[IDX_NUTR_OPT]
+    factor_nutrientes = nutrientes_mgL / (nutrientes_mgL + Km)
+    K = max(capacidad, 1.0)
+    factor_capacidad = max(0.0, 1.0 - (lemna_ton / K))
+    tasa_mortalidad = p[IDX_TASA_MORT] * (1.0 - factor_nutrientes)
+    crecimiento_neto = lemna_ton * (p[IDX_TASA_CREC] * factor_nutrientes * factor_capacidad
+                                    - tasa_mortalidad)
+    dL_dt = max(crecimiento_neto, -lemna_ton)
+
+    # min(0, ...) = 0 cuando remocion == 0, así que la resta es segura siempre.
+    remocion = max(0.0, p[IDX_REMOCION])
+    dL_dt -= min(remocion, max(lemna_ton + dL_dt, 0.0))
+
+    # --- Oxígeno ---
+    reox_natural = p[IDX_TASA_REOX] * (p[IDX_O2_SAT] - oxigeno_mgL)
+
+    # Antes del umbral la Lemna MEJORA el oxígeno (fotosíntesis); saturada,
+    # tapa la superficie y bloquea el intercambio de gases.
+    no_saturada = pct < umbral
+    produccion_o2 = K_PROD_O2 * lemna_ton * (pct / umbral)
+    dO_bajo = reox_natural + produccion_o2 - K_CONS_O2_LOW * lemna_ton
+
+    factor_bloqueo = min((pct - umbral) / ANCHO_BLOQUEO, 1.0)
+    dO_alto = reox_natural * (1.0 - factor_bloqueo * 0.9) - K_CONS_O2_HIGH * lemna_ton
+
+    dO_dt = (no_saturada * dO_bajo + (1.0 - no_saturada) * dO_alto
+             - p[IDX_CONS_O2_DESC] * nutrientes_mgL)
+
+    salidas = np.empty(4)
+    salidas[0] = dV_dt
+    salidas[1] = dN_dt
+    salidas[2] = dL_dt
+    salidas[3] = dO_dt
+    return salidas
+
+
+@njit(cache=True)
+def integrate_rk4(p, y0, t_final, dt):
+    """
+    Integrador Runge-Kutta de orden 4 con paso fijo.
+
+    Para este modelo ecológico suave de 4 variables, un RK4 a `paso_tiempo`
+    es más que suficiente en precisión y evita el ida-y-vuelta Python/C de
+    `solve_ivp`: todo el bucle temporal corre dentro de una sola función
+    compilada.
+
+    Args:
+        p (ndarray): Vector de parámetros (ver índices IDX_*)
+        y0 (ndarray): Estado inicial [volumen, nutrientes, lemna, oxigeno]
+        t_final (float): Tiempo final de simulación (años)
+        dt (float): Paso de salida (años)
+
+    Returns:
+        ndarray: Trayectoria de forma (n_pasos, 4), incluyendo el estado
+            inicial en la fila 0. El estado se recorta a valores físicos
+            (volumen >= 1, resto >= 0) tras cada paso.
+    """
+    # round() evita perder el ultimo paso cuando t_final/dt cae en
+    # 239.9999... por redondeo flotante
+    n_pasos = int(round(t_final / dt)) + 1
+    Y = np.empty((n_pasos, 4))
+    Y[0, :] = y0
+
+    if n_pasos < 2:
+        return Y
+
+    h = t_final / (n_pasos - 1)
+    y = y0.copy()
+
+    for i in range(1, n_pasos):
+        t = (i - 1) * h
+        k1 = rhs(t, y, p)
+        k2 = rhs(t + 0.5 * h, y + 0.5 * h * k1, p)
+        k3 = rhs(t + 0.5 * h, y + 0.5 * h * k2, p)
+        k4 = rhs(t + h, y + h * k3, p)
+        y = y + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+        # Recorte a valores físicos
+        y[0] = max(y[0], 1.0)
+        y[1] = max(y[1], 0.0)
+        y[2] = max(y[2], 0.0)
+        y[3] = max(y[3], 0.0)
+
+        Y[i, :] = y
+
+    return Y
+
+
+@njit(cache=True, parallel=True)
+def integrate_rk4_batch(P, Y0, t_final, dt):
+    """
+    Integra S escenarios en paralelo con un solo bucle compilado.
+
+    Ejecutar los escenarios uno por uno paga el overhead de Python S veces;
+    aquí el barrido completo corre dentro de una única función compilada con
+    `prange` sobre el eje de escenarios.
+
+    Args:
+        P (ndarray): Matriz (S, N_PARAMS) de vectores de parámetros
+        Y0 (ndarray): Estados iniciales (S, 4)
+        t_final (float): Tiempo final de simulación (años)
+        dt (float): Paso de salida (años)
+
+    Returns:
+        ndarray: Trayectorias de forma (S, n_pasos, 4)
+    """
+    S = P.shape[0]
+    n_pasos = max(int(round(t_final / dt)) + 1, 1)
+    salidas = np.empty((S, n_pasos, 4))
+
+    for s in prange(S):
+        salidas[s, :, :] = integrate_rk4(P[s], Y0[s], t_final, dt)
+
+    return salidas
@@ -6,17 +6,37 @@ VERSIÓN CORREGIDA - Comportamiento REAL de Lemna:
 3. Remoción: Mantiene nutrientes, oxígeno vuelve a inicial
 """
 
+import functools
+
 import numpy as np
-from scipy.integrate import solve_ivp
+from collections import ChainMap
+
+from core import _rhs
+
+
+@functools.lru_cache(maxsize=32)
+def _malla_tiempo(t_final, paso):
+    """
+    Malla temporal memoizada: en barridos de escenarios (t_final, paso) se
+    repite en cada simulación y no hace falta reconstruir el linspace.
+    El array se marca de solo lectura porque se comparte entre resultados.
+    """
+    # round() evita perder el último paso cuando t_final/paso cae en
+    # 239.9999... por redondeo flotante
+    num_pasos = int(round(t_final / paso)) + 1
+    t_eval = np.linspace(0.0, t_final, num_pasos)
+    t_eval.setflags(write=False)
+    return t_eval
 
 
 class ModeloTiticaca:
     def __init__(self, parametros, escenario):
-        self.params = parametros.copy() if parametros else {}
-        self.escenario = escenario.copy() if escenario else {}
-        
-        if 'parametros' in self.escenario and self.escenario['parametros']:
-            self.params.update(self.escenario['parametros'])
+        # Overlay pequeño sobre los dicts del llamador en lugar de copiarlos:
+        # las lecturas tocan primero el overlay y las escrituras (setdefault)
+        # quedan aisladas ahí sin tocar los dicts originales.
+        overlay = dict(escenario['parametros']) if escenario and escenario.get('parametros') else {}
+        self.params = ChainMap(overlay, parametros if parametros else {})
+        self.escenario = ChainMap({}, escenario if escenario else {})
 
         self.params.setdefault('limite_absorcion_lemna',
                                self.params.get('capacidad_carga_lemna', 2000))
@@ -42,56 +62,107 @@ class ModeloTiticaca:
         self.params.setdefault('consumo_o2_lemna', 0.001)
         self.params.setdefault('consumo_o2_descomposicion', 0.02)
         
-        # Umbral de saturación (95% = 0.95)
-        self.UMBRAL_SATURACION = 0.95
+        # Umbral de saturación (95% = 0.95), compartido con el RHS compilado
+        self.UMBRAL_SATURACION = _rhs.UMBRAL_SATURACION
+
+        # Escalares calientes fijados como atributos: las ecuaciones los leen
+        # en cada paso y un acceso de atributo evita el hash+probe del dict.
+        self._capacidad = float(self.params.get('capacidad_carga_lemna', 2000.0))
+        self._nutr_opt = float(self.params.get('nutrientes_optimo_lemna', 0.05))
+        self._tasa_crec = float(self.params.get('tasa_crecimiento_lemna', 0.3))
+        self._tasa_mort = float(self.params.get('tasa_mortalidad_lemna', 0.2))
+        self._tasa_abs = float(self.params.get('tasa_absorcion_nutrientes_lemna', 1e-6))
+        self._km_abs = float(self.params.get('km_absorcion_lemna', 0.02))
+        self._tasa_sed = float(self.params.get('tasa_sedimentacion_nutrientes', 0.02))
+        self._o2_sat = float(self.params.get('oxigeno_saturacion', 8.5))
+        self._tasa_reox = float(self.params.get('tasa_reoxigenacion', 1.0))
+        self._cons_o2_desc = float(self.params.get('consumo_o2_descomposicion', 0.02))
+        self._remocion = max(0.0, float(self.escenario.get('remocion_mecanica_lemna', 0.0)))
+
+        # Agregados invariantes del escenario: no dependen del estado ni del
+        # tiempo, así que se calculan una sola vez aquí y no en cada paso.
+        self._Q_in = (float(self.params.get('area_lago', 0.0))
+                      * float(self.params.get('precipitacion_anual', 0.0))
+                      + float(self.params.get('flujo_rios', 0.0)))
+        self._Q_out = (float(self.params.get('area_lago', 0.0))
+                       * float(self.params.get('evaporacion_anual', 0.0))
+                       + float(self.params.get('extraccion_humana', 0.0)))
 
-        self.resultado = None
+        eff_puno = self.escenario.get('eficiencia_tratamiento_puno', 0.0)
+        eff_juliaca = self.escenario.get('eficiencia_tratamiento_juliaca', 0.0)
+        self._carga_P = max(0.0,
+                            float(self.params.get('descarga_puno', 0.0)) * (1.0 - eff_puno)
+                            + float(self.params.get('descarga_juliaca', 0.0)) * (1.0 - eff_juliaca)
+                            + float(self.params.get('descarga_otras', 0.0)))
+
+        # Vector plano de parámetros para el RHS compilado (ver core/_rhs.py)
+        self._p = self._empacar_parametros()
+
+        # Buffer de derivadas reutilizado por ecuaciones() (la ruta Python)
+        self._dy = np.empty(4, dtype=np.float64)
+
+        self._Y = None
+        self._t = None
+        self._resultado = None
+        self._metricas = None
+
+    def _empacar_parametros(self):
+        """Empaca parámetros y escenario en un vector float64 para el RHS."""
+        p = np.empty(_rhs.N_PARAMS, dtype=np.float64)
+        p[_rhs.IDX_Q_IN] = self._Q_in
+        p[_rhs.IDX_Q_OUT] = self._Q_out
+        p[_rhs.IDX_CARGA] = self._carga_P
+        p[_rhs.IDX_TASA_SED] = self._tasa_sed
+        p[_rhs.IDX_TASA_ABS] = self._tasa_abs
+        p[_rhs.IDX_KM_ABS] = self._km_abs
+        p[_rhs.IDX_NUTR_OPT] = self._nutr_opt
+        p[_rhs.IDX_TASA_CREC] = self._tasa_crec
+        p[_rhs.IDX_TASA_MORT] = self._tasa_mort
+        p[_rhs.IDX_CAPACIDAD] = self._capacidad
+        p[_rhs.IDX_O2_SAT] = self._o2_sat
+        p[_rhs.IDX_TASA_REOX] = self._tasa_reox
+        p[_rhs.IDX_CONS_O2_DESC] = self._cons_o2_desc
+        p[_rhs.IDX_REMOCION] = self._remocion
+        p[_rhs.IDX_UMBRAL_SAT] = self.UMBRAL_SATURACION
+        return p
 
     def flujo_entrada_agua(self, volumen):
-        precipitacion = self.params.get('area_lago', 0.0) * self.params.get('precipitacion_anual', 0.0)
-        rios = self.params.get('flujo_rios', 0.0)
-        return precipitacion + rios
+        return self._Q_in
 
     def flujo_salida_agua(self, volumen):
-        evaporacion = self.params.get('area_lago', 0.0) * self.params.get('evaporacion_anual', 0.0)
-        extraccion = self.params.get('extraccion_humana', 0.0)
-        return evaporacion + extraccion
+        return self._Q_out
 
     def descarga_contaminantes(self):
-        eff_puno = self.escenario.get('eficiencia_tratamiento_puno', 0.0)
-        eff_juliaca = self.escenario.get('eficiencia_tratamiento_juliaca', 0.0)
-        descarga_puno = float(self.params.get('descarga_puno', 0.0)) * (1.0 - eff_puno)
-        descarga_juliaca = float(self.params.get('descarga_juliaca', 0.0)) * (1.0 - eff_juliaca)
-        descarga_otras = float(self.params.get('descarga_otras', 0.0))
-        return max(0.0, descarga_puno + descarga_juliaca + descarga_otras)
+        return self._carga_P
 
     def calcular_porcentaje_capacidad(self, lemna_ton):
         """Calcula qué porcentaje de la capacidad máxima ocupa la lemna."""
-        capacidad = float(self.params.get('capacidad_carga_lemna', 2000.0))
-        if capacidad <= 0:
+        if self._capacidad <= 0:
             return 0.0
-        return lemna_ton / capacidad  # 0.0 a 1.0+
+        return lemna_ton / self._capacidad  # 0.0 a 1.0+
 
     def crecimiento_lemna(self, nutrientes_mgL, lemna_ton):
         if lemna_ton <= 0:
             return 0.0
         
-        Km = float(self.params.get('nutrientes_optimo_lemna', 0.05))
+        Km = self._nutr_opt
         factor_nutrientes = nutrientes_mgL / (nutrientes_mgL + Km)
         
-        K = max(float(self.params.get('capacidad_carga_lemna', 2000.0)), 1.0)
+        K = max(self._capacidad, 1.0)
         factor_capacidad = max(0.0, 1.0 - (lemna_ton / K))
         
-        tasa_crecimiento = float(self.params.get('tasa_crecimiento_lemna', 0.3))
-        tasa_mortalidad_base = float(self.params.get('tasa_mortalidad_lemna', 0.2))
-        tasa_mortalidad = tasa_mortalidad_base * (1 - factor_nutrientes)
+        tasa_crecimiento = self._tasa_crec
+        tasa_mortalidad = self._tasa_mort * (1 - factor_nutrientes)
         
         crecimiento_neto = lemna_ton * (tasa_crecimiento * factor_nutrientes * factor_capacidad - tasa_mortalidad)
         return max(crecimiento_neto, -lemna_ton)
 
-    def consumo_nutrientes_lemna(self, nutrientes_mgL, lemna_ton, volumen_m3):
+    def consumo_nutrientes_lemna(self, nutrientes_mgL, lemna_ton, volumen_m3, pct=None):
         """
         ★★★ REGLA 1: NO absorbe nutrientes si lemna = 0 o lemna >= 95% capacidad ★★★
+
+        `pct` permite pasar el porcentaje de capacidad ya calculado para no
+        repetir la división cuando el llamador (ecuaciones) ya lo tiene.
         """
         # SIN LEMNA = SIN ABSORCIÓN
         if lemna_ton <= 1.0:
@@ -100,16 +171,16 @@ class ModeloTiticaca:
         if nutrientes_mgL <= 0 or volumen_m3 <= 0:
             return 0.0
         
-        # Calcular porcentaje de capacidad
-        pct = self.calcular_porcentaje_capacidad(lemna_ton)
+        if pct is None:
+            pct = self.calcular_porcentaje_capacidad(lemna_ton)
         
         # ★★★ AL 95% O MÁS = NO ABSORBE NUTRIENTES ★★★
         if pct >= self.UMBRAL_SATURACION:
             return 0.0
         
         # Absorción normal (solo si está entre 0% y 95%)
-        tasa_abs = float(self.params.get('tasa_absorcion_nutrientes_lemna', 1e-6))
-        Km = float(self.params.get('km_absorcion_lemna', 0.02))
+        tasa_abs = self._tasa_abs
+        Km = self._km_abs
         factor_saturacion = nutrientes_mgL / (nutrientes_mgL + Km)
         
         # Factor de eficiencia basado en densidad
@@ -128,16 +199,17 @@ class ModeloTiticaca:
         
         return max(0.0, min(consumo, nutrientes_mgL * 0.1))
 
-    def dinamica_oxigeno(self, oxigeno_mgL, lemna_ton, nutrientes_mgL):
+    def dinamica_oxigeno(self, oxigeno_mgL, lemna_ton, nutrientes_mgL, pct=None):
         """
         ★★★ REGLA 2: Oxígeno BAJA cuando lemna >= 95% capacidad ★★★
         - Antes del 95%: Lemna MEJORA oxígeno (fotosíntesis)
         - Al 95% o más: Lemna REDUCE oxígeno (tapa superficie)
         """
-        O2_sat = float(self.params.get('oxigeno_saturacion', 8.5))
-        tasa_reox = float(self.params.get('tasa_reoxigenacion', 1.0))
+        O2_sat = self._o2_sat
+        tasa_reox = self._tasa_reox
         
-        pct = self.calcular_porcentaje_capacidad(lemna_ton)
+        if pct is None:
+            pct = self.calcular_porcentaje_capacidad(lemna_ton)
         
         # Reoxigenación natural del agua
         reox_natural = tasa_reox * (O2_sat - oxigeno_mgL)
@@ -145,22 +217,22 @@ class ModeloTiticaca:
         if pct < self.UMBRAL_SATURACION:
             # ★ ANTES DEL 95%: Lemna MEJORA el oxígeno ★
             # Fotosíntesis produce oxígeno
-            produccion_o2 = 0.05 * lemna_ton * (pct / self.UMBRAL_SATURACION)
-            
+            produccion_o2 = _rhs.K_PROD_O2 * lemna_ton * (pct / self.UMBRAL_SATURACION)
+
             # Consumo mínimo
-            consumo_respiracion = 0.001 * lemna_ton
-            
+            consumo_respiracion = _rhs.K_CONS_O2_LOW * lemna_ton
+
             dO_dt = reox_natural + produccion_o2 - consumo_respiracion
         else:
             # ★★★ AL 95% O MÁS: Lemna REDUCE el oxígeno ★★★
             # La lemna tapa la superficie, bloquea intercambio de gases
-            
+
             # Reducir drásticamente la reoxigenación (la superficie está tapada)
-            factor_bloqueo = min((pct - self.UMBRAL_SATURACION) / 0.05, 1.0)  # 0 a 1 entre 95% y 100%
+            factor_bloqueo = min((pct - self.UMBRAL_SATURACION) / _rhs.ANCHO_BLOQUEO, 1.0)  # 0 a 1 entre 95% y 100%
             reox_reducida = reox_natural * (1.0 - factor_bloqueo * 0.9)  # Reduce hasta 90%
-            
+
             # Consumo alto por respiración de tanta biomasa
-            consumo_alto = 0.01 * lemna_ton
+            consumo_alto = _rhs.K_CONS_O2_HIGH * lemna_ton
             
             # Sin fotosíntesis efectiva (demasiado densa, se auto-sombrea)
             produccion_o2 = 0.0
@@ -168,120 +240,308 @@ class ModeloTiticaca:
             dO_dt = reox_reducida + produccion_o2 - consumo_alto
         
         # Consumo por descomposición de materia orgánica
-        consumo_descomp = float(self.params.get('consumo_o2_descomposicion', 0.02)) * nutrientes_mgL
+        consumo_descomp = self._cons_o2_desc * nutrientes_mgL
         
         return dO_dt - consumo_descomp
 
     def ecuaciones(self, t, y):
-        volumen_m3, nutrientes_mgL, lemna_ton, oxigeno_mgL = y
-        volumen_m3 = max(volumen_m3, 1.0)
-        nutrientes_mgL = max(nutrientes_mgL, 0.0)
-        lemna_ton = max(lemna_ton, 0.0)
-        oxigeno_mgL = max(oxigeno_mgL, 0.0)
+        # Cuerpo en línea recta: los helpers de arriba quedan como API para
+        # usuarios externos, pero aquí sus cuerpos están expandidos para no
+        # pagar ~10 despachos de método ligado por evaluación del RHS.
+        # float() baja los np.float64 del estado a floats nativos: toda la
+        # aritmética siguiente despacha por los slots de C de float en vez
+        # del protocolo de ufuncs escalares de NumPy.
+        volumen_m3 = float(y[0])
+        nutrientes_mgL = float(y[1])
+        lemna_ton = float(y[2])
+        oxigeno_mgL = float(y[3])
+        if volumen_m3 < 1.0:
+            volumen_m3 = 1.0
+        if nutrientes_mgL < 0.0:
+            nutrientes_mgL = 0.0
+        if lemna_ton < 0.0:
+            lemna_ton = 0.0
+        if oxigeno_mgL < 0.0:
+            oxigeno_mgL = 0.0
+
+        umbral = self.UMBRAL_SATURACION
 
         # Volumen
-        dV_dt = self.flujo_entrada_agua(volumen_m3) - self.flujo_salida_agua(volumen_m3)
-        
+        dV_dt = self._Q_in - self._Q_out
+
+        # Porcentaje de capacidad compartido por nutrientes y oxígeno
+        capacidad = self._capacidad
+        pct = lemna_ton / capacidad if capacidad > 0.0 else 0.0
+
         # Nutrientes
-        carga_mass = self.descarga_contaminantes()
-        carga_conc = (carga_mass * 1e6) / volumen_m3
-        
+        carga_conc = (self._carga_P * 1e6) / volumen_m3
+
         # ★ Consumo de nutrientes (0 si lemna=0 o lemna>=95%)
-        consumo_lemna = self.consumo_nutrientes_lemna(nutrientes_mgL, lemna_ton, volumen_m3)
-        
-        sedimentacion = float(self.params.get('tasa_sedimentacion_nutrientes', 0.02)) * nutrientes_mgL
-        dilucion = -nutrientes_mgL * (dV_dt / volumen_m3) if volumen_m3 > 0 else 0.0
-        
+        consumo_lemna = 0.0
+        if lemna_ton > 1.0 and nutrientes_mgL > 0.0 and pct < umbral:
+            factor_saturacion = nutrientes_mgL / (nutrientes_mgL + self._km_abs)
+            if pct < 0.5:
+                factor_eficiencia = pct * 2.0
+            else:
+                factor_eficiencia = (umbral - pct) / (umbral - 0.5)
+            factor_eficiencia = max(0.0, min(1.0, factor_eficiencia))
+
+            absorcion_ton = self._tasa_abs * lemna_ton * factor_saturacion * factor_eficiencia
+            consumo_lemna = (absorcion_ton * 1e9) / (volumen_m3 * 1000.0)
+            consumo_lemna = max(0.0, min(consumo_lemna, nutrientes_mgL * 0.1))
+
+        sedimentacion = self._tasa_sed * nutrientes_mgL
+        dilucion = -nutrientes_mgL * (dV_dt / volumen_m3)
+
         dN_dt = carga_conc - consumo_lemna - sedimentacion + dilucion
-        
+
         # Lemna
-        dL_dt = self.crecimiento_lemna(nutrientes_mgL, lemna_ton)
-        
-        remocion = max(0.0, self.escenario.get('remocion_mecanica_lemna', 0.0))
+        dL_dt = 0.0
+        if lemna_ton > 0.0:
+            factor_nutrientes = nutrientes_mgL / (nutrientes_mgL + self._nutr_opt)
+            K = max(capacidad, 1.0)
+            factor_capacidad = max(0.0, 1.0 - (lemna_ton / K))
+            tasa_mortalidad = self._tasa_mort * (1.0 - factor_nutrientes)
+            crecimiento_neto = lemna_ton * (self._tasa_crec * factor_nutrientes * factor_capacidad
+                                            - tasa_mortalidad)
+            dL_dt = max(crecimiento_neto, -lemna_ton)
+
+        remocion = self._remocion
         if remocion > 0.0:
             dL_dt -= min(remocion, max(lemna_ton + dL_dt, 0.0))
 
         # ★ Oxígeno (mejora antes del 95%, BAJA después)
-        dO_dt = self.dinamica_oxigeno(oxigeno_mgL, lemna_ton, nutrientes_mgL)
+        reox_natural = self._tasa_reox * (self._o2_sat - oxigeno_mgL)
+        if pct < umbral:
+            dO_dt = (reox_natural + _rhs.K_PROD_O2 * lemna_ton * (pct / umbral)
+                     - _rhs.K_CONS_O2_LOW * lemna_ton)
+        else:
+            factor_bloqueo = min((pct - umbral) / _rhs.ANCHO_BLOQUEO, 1.0)
+            dO_dt = reox_natural * (1.0 - factor_bloqueo * 0.9) - _rhs.K_CONS_O2_HIGH * lemna_ton
+
+        dO_dt -= self._cons_o2_desc * nutrientes_mgL
 
-        return np.array([dV_dt, dN_dt, dL_dt, dO_dt], dtype=float)
+        # Rellenar el buffer preasignado en lugar de construir un array nuevo
+        self._dy[0] = dV_dt
+        self._dy[1] = dN_dt
+        self._dy[2] = dL_dt
+        self._dy[3] = dO_dt
+        return self._dy
+
+    def jacobiano(self, t, y):
+        """
+        Jacobiano analítico 4x4 del sistema, siguiendo las mismas ramas que
+        las ecuaciones (umbral de saturación, clamps de consumo y remoción).
+
+        Útil para análisis de estabilidad o para integradores implícitos
+        (BDF/LSODA), que sin él aproximan estas derivadas con N+1
+        evaluaciones extra del RHS por diferencias finitas.
+
+        Args:
+            t (float): Tiempo (años); el sistema es autónomo
+            y (ndarray): Estado [volumen_m3, nutrientes_mgL, lemna_ton, oxigeno_mgL]
+
+        Returns:
+            ndarray: Matriz (4, 4) con J[i, j] = d(dy_i/dt)/d(y_j)
+        """
+        volumen_m3 = max(y[0], 1.0)
+        nutrientes_mgL = max(y[1], 0.0)
+        lemna_ton = max(y[2], 0.0)
+
+        J = np.zeros((4, 4))
+
+        dV_dt = self._Q_in - self._Q_out
+        pct = self.calcular_porcentaje_capacidad(lemna_ton)
+        K = max(self._capacidad, 1.0)
+        umbral = self.UMBRAL_SATURACION
+
+        # --- Fila 0: dV/dt constante ---
+        # (todas las derivadas son 0)
+
+        # --- Fila 1: dN/dt = carga - consumo - sedimentacion + dilucion ---
+        consumo = self.consumo_nutrientes_lemna(nutrientes_mgL, lemna_ton,
+                                                volumen_m3, pct)
+        dcons_dV = dcons_dN = dcons_dL = 0.0
+        if consumo > 0.0:
+            if consumo >= nutrientes_mgL * 0.1:
+                # Rama recortada por el tope del 10% de los nutrientes
+                dcons_dN = 0.1
+            else:
+                factor_saturacion = nutrientes_mgL / (nutrientes_mgL + self._km_abs)
+                if pct < 0.5:
+                    factor_eficiencia = pct * 2.0
+                    dfe_dL = 2.0 / K
+                else:
+                    factor_eficiencia = (umbral - pct) / (umbral - 0.5)
+                    dfe_dL = -1.0 / (K * (umbral - 0.5))
+                escala = self._tasa_abs * 1e6 / volumen_m3
+                dfs_dN = self._km_abs / (nutrientes_mgL + self._km_abs) ** 2
+                dcons_dV = -consumo / volumen_m3
+                dcons_dN = escala * lemna_ton * factor_eficiencia * dfs_dN
+                dcons_dL = escala * factor_saturacion * (factor_eficiencia
+                                                         + lemna_ton * dfe_dL)
+
+        J[1, 0] = (-self._carga_P * 1e6 / volumen_m3 ** 2 - dcons_dV
+                   + nutrientes_mgL * dV_dt / volumen_m3 ** 2)
+        J[1, 1] = -dcons_dN - self._tasa_sed - dV_dt / volumen_m3
+        J[1, 2] = -dcons_dL
+
+        # --- Fila 2: dL/dt = crecimiento neto - remocion ---
+        dcrec_dN = dcrec_dL = 0.0
+        crec = self.crecimiento_lemna(nutrientes_mgL, lemna_ton)
+        if lemna_ton > 0.0:
+            if crec <= -lemna_ton:
+                # Rama recortada: dL/dt = -L
+                dcrec_dL = -1.0
+            else:
+                fn = nutrientes_mgL / (nutrientes_mgL + self._nutr_opt)
+                dfn_dN = self._nutr_opt / (nutrientes_mgL + self._nutr_opt) ** 2
+                factor_capacidad = max(0.0, 1.0 - lemna_ton / K)
+                dcrec_dN = lemna_ton * (self._tasa_crec * factor_capacidad
+                                        + self._tasa_mort) * dfn_dN
+                dcrec_dL = (self._tasa_crec * fn * (1.0 - 2.0 * lemna_ton / K)
+                            - self._tasa_mort * (1.0 - fn))
+                if factor_capacidad == 0.0:
+                    # El clamp de capacidad anula el término de crecimiento
+                    dcrec_dN = lemna_ton * self._tasa_mort * dfn_dN
+                    dcrec_dL = -self._tasa_mort * (1.0 - fn)
+
+        J[2, 1] = dcrec_dN
+        J[2, 2] = dcrec_dL
+        if self._remocion > 0.0 and self._remocion >= lemna_ton + crec > 0.0:
+            # Remoción recortada a la biomasa disponible: dL/dt = -L
+            J[2, 1] = 0.0
+            J[2, 2] = -1.0
+
+        # --- Fila 3: dO/dt según régimen de saturación ---
+        J[3, 1] = -self._cons_o2_desc
+        if pct < umbral:
+            J[3, 2] = 2.0 * _rhs.K_PROD_O2 * lemna_ton / (K * umbral) - _rhs.K_CONS_O2_LOW
+            J[3, 3] = -self._tasa_reox
+        else:
+            factor_bloqueo = min((pct - umbral) / _rhs.ANCHO_BLOQUEO, 1.0)
+            atenuacion = 1.0 - factor_bloqueo * 0.9
+            reox_natural = self._tasa_reox * (self._o2_sat - max(y[3], 0.0))
+            J[3, 2] = -_rhs.K_CONS_O2_HIGH
+            if factor_bloqueo < 1.0:
+                J[3, 2] += reox_natural * (-0.9) / (_rhs.ANCHO_BLOQUEO * K)
+            J[3, 3] = -self._tasa_reox * atenuacion
+
+        return J
 
     def simular(self):
         t_final = float(self.params.get('tiempo_simulacion', 20.0))
         paso = float(self.params.get('paso_tiempo', 0.1))
 
         if t_final <= 0.0:
-            self.resultado = {
-                'tiempo': np.array([0.0]),
-                'volumen': np.array([self.estado_actual[0]]),
-                'nutrientes': np.array([self.estado_actual[1]]),
-                'lemna': np.array([self.estado_actual[2]]),
-                'oxigeno': np.array([self.estado_actual[3]]),
+            return self._registrar_trayectoria(
+                self.estado_actual.reshape(1, 4).copy(), np.array([0.0]))
+
+        t_eval = _malla_tiempo(t_final, paso)
+        self._num_pasos = len(t_eval)
+
+        Y = _rhs.integrate_rk4(self._p, self.estado_actual.astype(float),
+                               t_final, paso)
+
+        return self._registrar_trayectoria(Y, t_eval)
+
+    def _registrar_trayectoria(self, Y, t_eval):
+        """Guarda una trayectoria (n, 4); el dict de resultado se arma perezoso."""
+        # Trayectoria contigua (4, n) para métricas vectorizadas
+        self._Y = Y.T
+        self._t = t_eval
+        self._resultado = None
+        self._metricas = None
+
+        self.estado_actual = Y[-1, :].copy()
+        return self.resultado
+
+    @property
+    def resultado(self):
+        """Dict de resultado por variable, construido solo cuando se accede."""
+        if self._Y is None:
+            return None
+        if self._resultado is None:
+            self._resultado = {
+                'tiempo': self._t,
+                'volumen': self._Y[0],
+                'nutrientes': self._Y[1],
+                'lemna': self._Y[2],
+                'oxigeno': self._Y[3],
                 'escenario': self.escenario.get('nombre', 'default'),
                 'exito': True
             }
-            return self.resultado
-
-        num_pasos = int(t_final / paso) + 1
-        t_eval = np.linspace(0.0, t_final, num_pasos)
-
-        solucion = solve_ivp(
-            fun=self.ecuaciones,
-            t_span=(0.0, t_final),
-            y0=self.estado_actual.astype(float),
-            method='RK45',
-            t_eval=t_eval,
-            rtol=1e-6,
-            atol=1e-9
-        )
-
-        if not solucion.success:
-            raise RuntimeError(f"Error: {solucion.message}")
-
-        self.resultado = {
-            'tiempo': solucion.t,
-            'volumen': solucion.y[0],
-            'nutrientes': solucion.y[1],
-            'lemna': solucion.y[2],
-            'oxigeno': solucion.y[3],
-            'escenario': self.escenario.get('nombre', 'default'),
-            'exito': True
-        }
+        return self._resultado
 
-        self.estado_actual = solucion.y[:, -1].copy()
-        return self.resultado
+    @classmethod
+    def simular_muchos(cls, parametros, escenarios):
+        """
+        Simula varios escenarios como un solo lote compilado en paralelo.
+
+        Args:
+            parametros (dict): Parámetros base compartidos
+            escenarios (list): Configuraciones de escenario (dicts)
+
+        Returns:
+            list: Instancias de ModeloTiticaca con resultado ya poblado,
+                en el mismo orden que `escenarios`
+        """
+        modelos = [cls(parametros, escenario) for escenario in escenarios]
+        if not modelos:
+            return []
+
+        t_final = float(modelos[0].params.get('tiempo_simulacion', 20.0))
+        paso = float(modelos[0].params.get('paso_tiempo', 0.1))
+
+        if t_final <= 0.0:
+            for modelo in modelos:
+                modelo.simular()
+            return modelos
+
+        P = np.stack([modelo._p for modelo in modelos])
+        Y0 = np.stack([modelo.estado_actual.astype(float) for modelo in modelos])
+
+        lote = _rhs.integrate_rk4_batch(P, Y0, t_final, paso)
+
+        t_eval = _malla_tiempo(t_final, paso)
+        for modelo, Y in zip(modelos, lote):
+            modelo._registrar_trayectoria(Y, t_eval)
+
+        return modelos
 
     def obtener_metricas(self):
-        if self.resultado is None:
+        if self._Y is None:
             raise ValueError("Ejecute simular() primero")
 
-        inicial = {
-            'nutrientes': float(self.resultado['nutrientes'][0]),
-            'lemna': float(self.resultado['lemna'][0]),
-            'oxigeno': float(self.resultado['oxigeno'][0])
-        }
-        final = {
-            'nutrientes': float(self.resultado['nutrientes'][-1]),
-            'lemna': float(self.resultado['lemna'][-1]),
-            'oxigeno': float(self.resultado['oxigeno'][-1])
-        }
+        # Dashboards y bucles de barrido piden las métricas varias veces por
+        # trayectoria; se calculan una vez y se invalidan al re-simular.
+        if self._metricas is not None:
+            return self._metricas
+
+        # Filas 1..3 de la trayectoria: nutrientes, lemna, oxigeno
+        inicial = self._Y[1:, 0]
+        final = self._Y[1:, -1]
 
-        capacidad = float(self.params.get('capacidad_carga_lemna', 2000.0))
-        pct_capacidad = (final['lemna'] / capacidad) * 100.0 if capacidad > 0 else 0.0
+        # Cambio porcentual en una sola operación vectorizada (0 si inicial=0)
+        pct = np.divide(inicial - final, inicial,
+                        out=np.zeros(3), where=inicial != 0.0) * 100.0
 
-        return {
-            'reduccion_nutrientes_pct': ((inicial['nutrientes'] - final['nutrientes']) / inicial['nutrientes'] * 100.0) if inicial['nutrientes'] != 0 else 0.0,
-            'reduccion_lemna_pct': ((inicial['lemna'] - final['lemna']) / inicial['lemna'] * 100.0) if inicial['lemna'] != 0 else 0.0,
-            'mejora_oxigeno_pct': ((final['oxigeno'] - inicial['oxigeno']) / inicial['oxigeno'] * 100.0) if inicial['oxigeno'] != 0 else 0.0,
-            'nutrientes_final': final['nutrientes'],
-            'lemna_final': final['lemna'],
-            'oxigeno_final': final['oxigeno'],
+        pct_capacidad = (final[1] / self._capacidad) * 100.0 if self._capacidad > 0 else 0.0
+
+        self._metricas = {
+            'reduccion_nutrientes_pct': float(pct[0]),
+            'reduccion_lemna_pct': float(pct[1]),
+            'mejora_oxigeno_pct': float(-pct[2]),
+            'nutrientes_final': float(final[0]),
+            'lemna_final': float(final[1]),
+            'oxigeno_final': float(final[2]),
             'tiempo_simulacion': self.params.get('tiempo_simulacion', 20.0),
-            'nutrientes_inicial': inicial['nutrientes'],
-            'lemna_inicial': inicial['lemna'],
-            'oxigeno_inicial': inicial['oxigeno'],
+            'nutrientes_inicial': float(inicial[0]),
+            'lemna_inicial': float(inicial[1]),
+            'oxigeno_inicial': float(inicial[2]),
             'porcentaje_capacidad_lemna': pct_capacidad,
         }
+        return self._metricas
 
     def porcentaje_absorcion_lemna(self):
         limite = self.params.get('capacidad_carga_lemna', 2000.0)
@@ -332,7 +592,13 @@ class ModeloTiticaca:
 
     def resetear_estado(self):
         self.estado_actual = self.estado_inicial.copy()
-        self.resultado = None
+        # Buffer de derivadas reutilizado por ecuaciones() (la ruta Python)
+        self._dy = np.empty(4, dtype=np.float64)
+
+        self._Y = None
+        self._t = None
+        self._resultado = None
+        self._metricas = None
 
     def obtener_porcentaje_nutrientes_restantes(self):
         inicial = float(self.estado_inicial[1])
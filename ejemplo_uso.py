@@ -124,22 +124,23 @@ def ejemplo_4_analisis_sensibilidad():
     # Probar diferentes eficiencias de tratamiento
     eficiencias = [0.3, 0.5, 0.7, 0.9, 0.95]
     resultados = []
-    
+
     print("Analizando impacto de eficiencia de tratamiento...")
     print(f"{'Eficiencia':>12} | {'Red. Nutrientes':>15} | {'Red. Lemna':>12} | {'Mejora O₂':>10}")
     print("-"*60)
-    
-    for eff in eficiencias:
-        escenario = crear_escenario_personalizado(
-            f"Tratamiento {int(eff*100)}%",
-            eff, eff, 0
-        )
-        
-        params = obtener_parametros({'tiempo_simulacion': 20})
-        modelo = ModeloTiticaca(params, escenario)
-        resultado = modelo.simular()
+
+    # Todo el barrido se integra como un solo lote compilado en paralelo
+    # en lugar de una llamada a simular() por eficiencia
+    escenarios = [
+        crear_escenario_personalizado(f"Tratamiento {int(eff*100)}%", eff, eff, 0)
+        for eff in eficiencias
+    ]
+    params = obtener_parametros({'tiempo_simulacion': 20})
+    modelos = ModeloTiticaca.simular_muchos(params, escenarios)
+
+    for eff, modelo in zip(eficiencias, modelos):
         metricas = modelo.obtener_metricas()
-        
+
         resultados.append({
             'eficiencia': eff,
             'reduccion_nutrientes': metricas['reduccion_nutrientes_pct'],
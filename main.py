@@ -21,7 +21,6 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from simulation.runner import RunnerSimulacion
-from visualization.graficos import GraficadorTiticaca
 from config.escenarios import listar_escenarios
 
 
@@ -71,6 +70,14 @@ def parsear_argumentos():
         help='Añade X toneladas de Lemna cada vez que la absorción llegue a 100%'
     )
 
+    parser.add_argument(
+        '--formato',
+        type=str,
+        choices=['csv', 'hdf5'],
+        default='csv',
+        help='Formato de los resultados guardados (default: csv)'
+    )
+
     parser.add_argument(
         '--dir-resultados',
         type=str,
@@ -120,12 +127,16 @@ def main():
     # 2. GUARDAR RESULTADOS
     # ============================
     if not args.no_guardar:
-        runner.guardar_resultados(args.dir_resultados)
+        runner.guardar_resultados(args.dir_resultados, formato=args.formato)
 
     # ============================
     # 3. GENERAR GRÁFICOS
     # ============================
     if runner.resultados:
+        # Import diferido: matplotlib/plotly tardan cientos de ms en cargar
+        # y solo hacen falta si de verdad se van a generar graficos
+        from visualization.graficos import GraficadorTiticaca
+
         graficador = GraficadorTiticaca(runner)
         
         if not args.no_guardar:
@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.modelo import ModeloTiticaca
 from config.parametros import obtener_parametros
 from config.escenarios import ESCENARIOS, obtener_escenario
-import pandas as pd
 from datetime import datetime
 
 
@@ -96,16 +95,40 @@ class RunnerSimulacion:
             print(f"# Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"{'#'*60}\n")
         
-        for i, nombre in enumerate(escenarios, 1):
+        # Validar los nombres por adelantado contra ESCENARIOS en lugar de
+        # atrapar la excepción de obtener_escenario nombre por nombre; los
+        # escenarios válidos se integran todos juntos como un solo lote
+        # compilado en paralelo (ModeloTiticaca.simular_muchos).
+        for nombre in escenarios:
+            if nombre not in ESCENARIOS:
+                print(f"ERROR en escenario '{nombre}': no existe. "
+                      f"Escenarios disponibles: {list(ESCENARIOS.keys())}")
+
+        nombres_validos = [nombre for nombre in escenarios if nombre in ESCENARIOS]
+        configs = [obtener_escenario(nombre) for nombre in nombres_validos]
+
+        try:
+            modelos = ModeloTiticaca.simular_muchos(self.parametros, configs)
+        except Exception as e:
+            print(f"ERROR en lote de escenarios: {str(e)}")
+            modelos = []
+
+        for i, (nombre, modelo) in enumerate(zip(nombres_validos, modelos), 1):
+            self.resultados[nombre] = modelo.resultado
+            self.metricas[nombre] = modelo.obtener_metricas()
+
             if verbose:
-                print(f"\n[{i}/{len(escenarios)}] ", end="")
-            
-            try:
-                self.ejecutar_escenario(nombre, verbose=verbose)
-            except Exception as e:
-                print(f"ERROR en escenario '{nombre}': {str(e)}")
-                continue
-        
+                escenario = ESCENARIOS[nombre]
+                metricas = self.metricas[nombre]
+                print(f"\n[{i}/{len(nombres_validos)}] {nombre}")
+                print(f"  Descripción: {escenario['descripcion']}")
+                print(f"  Nutrientes: {metricas['nutrientes_final']:.2f} mg/L "
+                      f"({metricas['reduccion_nutrientes_pct']:+.1f}%)")
+                print(f"  Lemna: {metricas['lemna_final']:.0f} ton "
+                      f"({metricas['reduccion_lemna_pct']:+.1f}%)")
+                print(f"  Oxígeno: {metricas['oxigeno_final']:.2f} mg/L "
+                      f"({metricas['mejora_oxigeno_pct']:+.1f}%)")
+
         if verbose:
             print(f"\n{'='*60}")
             print("SIMULACIONES COMPLETADAS")
@@ -120,27 +143,26 @@ class RunnerSimulacion:
         """
         if not self.metricas:
             raise ValueError("No hay resultados. Ejecute simulaciones primero.")
-        
-        datos = []
-        for nombre, metricas in self.metricas.items():
-            escenario = ESCENARIOS[nombre]
-            
-            fila = {
-                'Escenario': escenario['nombre'],
-                'Efic. Puno (%)': escenario['eficiencia_tratamiento_puno'] * 100,
-                'Efic. Juliaca (%)': escenario['eficiencia_tratamiento_juliaca'] * 100,
-                'Remoción Lemna (ton/año)': escenario['remocion_mecanica_lemna'],
-                'Nutrientes Final (mg/L)': metricas['nutrientes_final'],
-                'Reducción Nutrientes (%)': metricas['reduccion_nutrientes_pct'],
-                'Lemna Final (ton)': metricas['lemna_final'],
-                'Reducción Lemna (%)': metricas['reduccion_lemna_pct'],
-                'Oxígeno Final (mg/L)': metricas['oxigeno_final'],
-                'Mejora Oxígeno (%)': metricas['mejora_oxigeno_pct']
-            }
-            
-            datos.append(fila)
-        
-        df = pd.DataFrame(datos)
+
+        import pandas as pd
+
+        # Construcción por columnas: pandas recibe cada columna como una
+        # lista homogénea de una vez, en lugar de ensamblar fila a fila.
+        escenarios = [ESCENARIOS[nombre] for nombre in self.metricas]
+        metricas = list(self.metricas.values())
+
+        df = pd.DataFrame({
+            'Escenario': [e['nombre'] for e in escenarios],
+            'Efic. Puno (%)': [e['eficiencia_tratamiento_puno'] * 100 for e in escenarios],
+            'Efic. Juliaca (%)': [e['eficiencia_tratamiento_juliaca'] * 100 for e in escenarios],
+            'Remoción Lemna (ton/año)': [e['remocion_mecanica_lemna'] for e in escenarios],
+            'Nutrientes Final (mg/L)': [m['nutrientes_final'] for m in metricas],
+            'Reducción Nutrientes (%)': [m['reduccion_nutrientes_pct'] for m in metricas],
+            'Lemna Final (ton)': [m['lemna_final'] for m in metricas],
+            'Reducción Lemna (%)': [m['reduccion_lemna_pct'] for m in metricas],
+            'Oxígeno Final (mg/L)': [m['oxigeno_final'] for m in metricas],
+            'Mejora Oxígeno (%)': [m['mejora_oxigeno_pct'] for m in metricas]
+        })
         return df
     
     def obtener_datos_serie_temporal(self):
@@ -152,50 +174,73 @@ class RunnerSimulacion:
         """
         if not self.resultados:
             raise ValueError("No hay resultados. Ejecute simulaciones primero.")
-        
-        # Crear DataFrames para cada variable
+
+        import numpy as np
+        import pandas as pd
+
+        # Nombres de columna y tiempo resueltos una sola vez; cada DataFrame
+        # se construye desde un bloque contiguo (column_stack) en vez de un
+        # dict de arrays sueltos por escenario.
+        nombres = list(self.resultados)
+        columnas = [ESCENARIOS[nombre]['nombre'] for nombre in nombres]
+        tiempo = self.resultados[nombres[0]]['tiempo']
+
         dfs = {}
         variables = ['nutrientes', 'lemna', 'oxigeno', 'volumen']
-        
+
         for var in variables:
-            data = {}
-            tiempo = None
-            
-            for nombre, resultado in self.resultados.items():
-                if tiempo is None:
-                    tiempo = resultado['tiempo']
-                
-                data[ESCENARIOS[nombre]['nombre']] = resultado[var]
-            
-            df = pd.DataFrame(data)
+            bloque = np.column_stack([self.resultados[nombre][var] for nombre in nombres])
+            df = pd.DataFrame(bloque, columns=columnas)
             df.insert(0, 'Tiempo (años)', tiempo)
             dfs[var] = df
-        
+
         return dfs
     
-    def guardar_resultados(self, directorio='resultados'):
+    def guardar_resultados(self, directorio='resultados', formato='csv'):
         """
-        Guarda todos los resultados en archivos CSV.
-        
+        Guarda todos los resultados en disco.
+
         Args:
             directorio (str): Directorio donde guardar los archivos
+            formato (str): 'csv' (un archivo de texto por serie, por defecto)
+                        o 'hdf5' (un solo archivo binario resultados.h5,
+                        más rápido de escribir y releer; requiere pytables)
         """
         import os
-        
+
         os.makedirs(directorio, exist_ok=True)
-        
-        # Guardar tabla comparativa
+
         tabla = self.generar_tabla_comparativa()
+        series = self.obtener_datos_serie_temporal()
+
+        if formato == 'hdf5':
+            import pandas as pd
+
+            # Un solo almacén binario comprimido en vez de N archivos de texto
+            with pd.HDFStore(f'{directorio}/resultados.h5', mode='w',
+                             complevel=4, complib='blosc') as store:
+                store.put('comparativa', tabla)
+                for var, df in series.items():
+                    store.put(f'series/{var}', df)
+            return
+
+        if formato != 'csv':
+            raise ValueError(f"Formato '{formato}' no soportado. "
+                            f"Formatos disponibles: ['csv', 'hdf5']")
+
+        # Guardar tabla comparativa
         tabla.to_csv(f'{directorio}/comparativa_escenarios.csv', index=False)
         # print(f"✓ Guardada tabla comparativa: {directorio}/comparativa_escenarios.csv")
-        
-        # Guardar series temporales
-        series = self.obtener_datos_serie_temporal()
+
+        # Guardar series temporales. float_format acota cada valor a 6
+        # cifras significativas (el repr completo de 17 dígitos triplica el
+        # tamaño y el tiempo de escritura sin aportar precisión al modelo)
+        # y chunksize mantiene pequeño el buffer de pandas.
         for var, df in series.items():
             archivo = f'{directorio}/serie_{var}.csv'
-            df.to_csv(archivo, index=False)
+            df.to_csv(archivo, index=False, float_format='%.6g', chunksize=10000)
             # print(f"✓ Guardada serie temporal de {var}: {archivo}")
-        
+
         # print(f"\nTodos los resultados guardados en: {directorio}/")
     
     def mejor_escenario(self, criterio='reduccion_nutrientes_pct'):
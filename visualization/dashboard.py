@@ -12,15 +12,50 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.modelo import ModeloTiticaca
 from config.parametros import obtener_parametros
 from config.escenarios import (ESCENARIOS, crear_escenario_personalizado, obtener_descripcion_escenarios)
-from simulation.runner import RunnerSimulacion
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 import glob
 
+# Plantilla registrada una sola vez a nivel de módulo: todas las figuras
+# heredan el layout común (eje de tiempo, altura, hover unificado) sin
+# reconstruir el mismo dict en cada llamada a crear_grafico_variable.
+pio.templates['titicaca'] = go.layout.Template(layout=dict(
+    xaxis=dict(title=dict(text='Tiempo (años)')),
+    height=400,
+    hovermode='x unified'
+))
+pio.templates.default = 'plotly+titicaca'
+
+# Configuración compartida de st.plotly_chart: sin barra de modo ni logo,
+# menos payload y menos trabajo de Plotly.js en cada rerun (el zoom por
+# arrastre y el hover siguen disponibles)
+_PLOTLY_CONFIG = {'displayModeBar': False, 'responsive': True}
+
+# ttl corto: clics repetidos de "Cargar Resultados" dentro de la sesión se
+# sirven de memoria, pero resultados recién guardados se recogen en minutos
+@st.cache_data(ttl=300, show_spinner=False)
 def cargar_resultados_guardados():
-    """Carga resultados previamente guardados."""
+    """Carga resultados previamente guardados.
+
+    Prefiere el archivo binario resultados/resultados.h5 (escrito por
+    guardar_resultados(formato='hdf5'): una sola lectura tipada y
+    comprimida en vez de parsear un CSV de texto por variable); si no
+    existe o pytables no está instalado, cae a los CSV por serie.
+    """
+    ruta_h5 = 'resultados/resultados.h5'
+    if os.path.exists(ruta_h5):
+        try:
+            with pd.HDFStore(ruta_h5, mode='r') as store:
+                df_comparativa = store['comparativa']
+                series = {clave.rsplit('/', 1)[1]: store[clave]
+                          for clave in store.keys()
+                          if clave.startswith('/series/')}
+            return df_comparativa, series
+        except (OSError, KeyError, ImportError):
+            pass
     try:
         df_comparativa = pd.read_csv('resultados/comparativa_escenarios.csv')
         series = {}
@@ -72,20 +107,50 @@ if 'df_comparativa' in st.session_state:
     st.subheader("Series Temporales Guardadas")
 
 # Cache de resultados - INICIALIZACIÓN COMPLETA
-if 'resultados_cache' not in st.session_state:
-    st.session_state.resultados_cache = {}
-if 'modelo_actual' not in st.session_state:
-    st.session_state.modelo_actual = None
-if 'metricas_cache' not in st.session_state:
-    st.session_state.metricas_cache = None
-if 'escenario_actual' not in st.session_state:
-    st.session_state.escenario_actual = None
-if 'params_actual' not in st.session_state:
-    st.session_state.params_actual = None
-if 'lemna_agregada_total' not in st.session_state:
-    st.session_state.lemna_agregada_total = 0.0
-if 'metricas_todas_cache' not in st.session_state:
-    st.session_state.metricas_todas_cache = {}
+# Todos los valores por defecto de la sesión en un solo lugar; los
+# mutables van como fábricas para no compartir el mismo dict entre sesiones
+_DEFAULTS = {
+    'resultados_cache': dict,
+    'modelo_actual': lambda: None,
+    'metricas_cache': lambda: None,
+    'escenario_actual': lambda: None,
+    'params_actual': lambda: None,
+    'lemna_agregada_total': lambda: 0.0,
+    'metricas_todas_cache': dict
+}
+for _clave, _fabrica in _DEFAULTS.items():
+    if _clave not in st.session_state:
+        st.session_state[_clave] = _fabrica()
+
+
+@st.cache_data(show_spinner=False)
+def catalogos_escenarios():
+    """Listas de selección derivadas de ESCENARIOS, estáticas por proceso.
+
+    Streamlit re-ejecuta el script completo en cada interacción; estos
+    catálogos se calculan una vez y los reruns los leen del cache.
+    """
+    descripciones = obtener_descripcion_escenarios()
+    opciones = [v['nombre_completo'] for v in descripciones.values()]
+    opcion_a_tecnico = dict(zip(opciones, descripciones))
+    nombres = [ESCENARIOS[e]['nombre'] for e in ESCENARIOS]
+    nombre_a_tecnico = dict(zip(nombres, ESCENARIOS))
+    return opciones, opcion_a_tecnico, nombres, nombre_a_tecnico
+
+
+@st.cache_data(show_spinner=False)
+def simular_modelo(parametros, escenario):
+    """
+    Simula un escenario SIN tocar el estado de la sesión - para Comparación.
+
+    Memoizada con st.cache_data: repetir la comparación con los mismos
+    (parametros, escenario) devuelve el resultado guardado sin volver a
+    integrar el modelo.
+    """
+    modelo = ModeloTiticaca(parametros, escenario)
+    resultado = modelo.simular()
+    metricas = modelo.obtener_metricas()
+    return resultado, metricas
 
 
 def crear_nuevo_modelo(parametros, escenario):
@@ -106,21 +171,50 @@ def simular_modelo_existente():
     return resultado, metricas
 
 
-def crear_grafico_variable(resultados_dict, variable, titulo, ylabel, mostrar_critico=False):
-    """Crea gráfico de plotly para una variable."""
-    fig = go.Figure()
+# Variable, título de subgráfico, etiqueta del eje Y y celda en la grilla 2x2
+_GRID_VARIABLES = [
+    ('nutrientes', 'Concentración de Nutrientes', 'Nutrientes (mg/L)', 1, 1),
+    ('oxigeno', 'Oxígeno Disuelto', 'Oxígeno (mg/L)', 1, 2),
+    ('lemna', 'Biomasa de Lemna', 'Lemna (ton)', 2, 1),
+    ('volumen', 'Volumen del Lago', 'Volumen (m³)', 2, 2)
+]
+
+
+def crear_grid_variables(resultados_dict):
+    """Crea una sola figura 2x2 con las cuatro variables del modelo.
+
+    Un único payload y una única instancia de Plotly.js en el navegador
+    en lugar de cuatro componentes st.plotly_chart separados; la leyenda
+    se comparte agrupando las trazas por escenario (legendgroup).
+    """
+    # Scattergl dibuja con WebGL en el navegador: con varios escenarios y
+    # simulaciones largas renderiza mucho más rápido que el Scatter SVG.
+    fig = make_subplots(rows=2, cols=2,
+                        subplot_titles=[t for _, t, _, _, _ in _GRID_VARIABLES])
+    # Las trazas se acumulan en listas y se agregan en un solo add_traces:
+    # una pasada de validación de Plotly en lugar de una por traza
+    trazas, filas, cols = [], [], []
     for nombre, datos in resultados_dict.items():
-        fig.add_trace(go.Scatter(
-            x=datos['tiempo'], y=datos[variable], name=nombre,
-            mode='lines', line=dict(width=3)
-        ))
-    if mostrar_critico and variable == 'oxigeno':
-        fig.add_hline(y=6, line_dash="dash", line_color="red",
-                    annotation_text="Nivel Crítico")
-    fig.update_layout(
-        title=titulo, xaxis_title="Tiempo (años)",
-        yaxis_title=ylabel, height=400, hovermode='x unified'
-    )
+        # float32 basta de sobra para una curva en pantalla y reduce a la
+        # mitad el payload que Plotly serializa hacia el navegador; el
+        # modelo y las métricas siguen calculándose en float64.
+        tiempo = np.asarray(datos['tiempo'], dtype=np.float32)
+        for variable, _, _, fila, col in _GRID_VARIABLES:
+            trazas.append(go.Scattergl(
+                x=tiempo,
+                y=np.asarray(datos[variable], dtype=np.float32),
+                name=nombre, mode='lines', line=dict(width=3),
+                legendgroup=nombre, showlegend=(variable == 'nutrientes')
+            ))
+            filas.append(fila)
+            cols.append(col)
+    fig.add_traces(trazas, rows=filas, cols=cols)
+    fig.add_hline(y=6, line_dash="dash", line_color="red",
+                  annotation_text="Nivel Crítico", row=1, col=2)
+    for variable, _, ylabel, fila, col in _GRID_VARIABLES:
+        fig.update_xaxes(title_text="Tiempo (años)", row=fila, col=col)
+        fig.update_yaxes(title_text=ylabel, row=fila, col=col)
+    fig.update_layout(height=800, uirevision='grid')
     return fig
 
 
@@ -135,14 +229,11 @@ def actualizar_resultados_cache(nombre_escenario, resultado, metricas):
 # ================================
 if modo == "Escenarios Predefinidos":
     st.sidebar.subheader("Selección de Escenario")
-    
-    descripciones = obtener_descripcion_escenarios()
-    opciones = [f"{v['nombre_completo']}" for v in descripciones.values()]
-    nombres_tecnicos = list(descripciones.keys())
-    
+
+    opciones, opcion_a_tecnico, _, _ = catalogos_escenarios()
+
     seleccion = st.sidebar.selectbox("Escenario:", opciones)
-    idx = opciones.index(seleccion)
-    nombre_escenario = nombres_tecnicos[idx]
+    nombre_escenario = opcion_a_tecnico[seleccion]
     
     escenario = ESCENARIOS[nombre_escenario]
     
@@ -247,12 +338,14 @@ if modo == "Escenarios Predefinidos":
                 
                 nueva_lemna = st.session_state.lemna_inicial_original + st.session_state.lemna_agregada_total
                 
-                st.session_state.modelo_actual.estado_actual = np.array([
+                # Asignación in situ sobre el vector de estado ya asignado
+                # por el modelo, en vez de construir un np.array nuevo por clic
+                st.session_state.modelo_actual.estado_actual[:] = (
                     params.get('volumen_inicial', 8.93e11),
                     params.get('nutrientes_inicial', 0.028),
                     nueva_lemna,
                     params.get('oxigeno_inicial', 8.0)
-                ])
+                )
                 
                 resultado_nuevo, metricas_nuevo = simular_modelo_existente()
                 nombre_esc = st.session_state.escenario_actual['nombre']
@@ -302,23 +395,8 @@ if modo == "Escenarios Predefinidos":
                       delta=f"{metricas['oxigeno_final']:.2f} mg/L")
 
         st.markdown("---")
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'nutrientes',
-                'Concentración de Nutrientes', 'Nutrientes (mg/L)'), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'lemna',
-                'Biomasa de Lenteja de Agua', 'Lemna (ton)'), use_container_width=True)
-
-        with col2:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'oxigeno',
-                'Oxígeno Disuelto', 'mg/L', mostrar_critico=True), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'volumen',
-                'Volumen del Lago', 'm³'), use_container_width=True)
+        st.plotly_chart(crear_grid_variables(st.session_state.resultados_cache),
+                        use_container_width=True, config=_PLOTLY_CONFIG)
 
 
 # ================================
@@ -406,12 +484,14 @@ elif modo == "Escenario Personalizado":
                 
                 nueva_lemna = st.session_state.lemna_inicial_original + st.session_state.lemna_agregada_total
                 
-                st.session_state.modelo_actual.estado_actual = np.array([
+                # Asignación in situ sobre el vector de estado ya asignado
+                # por el modelo, en vez de construir un np.array nuevo por clic
+                st.session_state.modelo_actual.estado_actual[:] = (
                     params.get('volumen_inicial', 8.93e11),
                     params.get('nutrientes_inicial', 0.028),
                     nueva_lemna,
                     params.get('oxigeno_inicial', 8.0)
-                ])
+                )
                 
                 resultado_nuevo, metricas_nuevo = simular_modelo_existente()
                 actualizar_resultados_cache("Escenario Personalizado", resultado_nuevo, metricas_nuevo)
@@ -449,23 +529,8 @@ elif modo == "Escenario Personalizado":
                       delta=f"{metricas['oxigeno_final']:.2f} mg/L")
         
         st.markdown("---")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'nutrientes',
-                'Concentración de Nutrientes', 'Nutrientes (mg/L)'), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'lemna',
-                'Biomasa de Lemna', 'Lemna (toneladas)'), use_container_width=True)
-        
-        with col2:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'oxigeno',
-                'Oxígeno Disuelto', 'Oxígeno (mg/L)', mostrar_critico=True), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'volumen',
-                'Volumen del Lago', 'Volumen (m³)'), use_container_width=True)
+        st.plotly_chart(crear_grid_variables(st.session_state.resultados_cache),
+                        use_container_width=True, config=_PLOTLY_CONFIG)
 
 
 # ================================
@@ -474,9 +539,10 @@ elif modo == "Escenario Personalizado":
 elif modo == "Comparación Múltiple":
     st.sidebar.subheader("Selección de Escenarios")
     
-    escenarios_disponibles = list(ESCENARIOS.keys())
-    escenarios_nombres = [ESCENARIOS[e]['nombre'] for e in escenarios_disponibles]
-    
+    # Mapeo directo nombre mostrado -> clave técnica, en lugar de buscar
+    # con list.index() por cada escenario seleccionado en cada clic
+    _, _, escenarios_nombres, nombre_a_tecnico = catalogos_escenarios()
+
     seleccionados = st.sidebar.multiselect(
         "Escenarios a comparar:",
         escenarios_nombres,
@@ -495,14 +561,10 @@ elif modo == "Comparación Múltiple":
                 metricas_todas = {}
                 
                 for nombre_mostrar in seleccionados:
-                    idx = escenarios_nombres.index(nombre_mostrar)
-                    nombre_tecnico = escenarios_disponibles[idx]
-                    escenario = ESCENARIOS[nombre_tecnico]
-                    
-                    modelo = ModeloTiticaca(params, escenario)
-                    resultado = modelo.simular()
-                    metricas = modelo.obtener_metricas()
-                    
+                    escenario = ESCENARIOS[nombre_a_tecnico[nombre_mostrar]]
+
+                    resultado, metricas = simular_modelo(params, escenario)
+
                     resultados[escenario['nombre']] = resultado
                     metricas_todas[escenario['nombre']] = metricas
                 
@@ -516,43 +578,38 @@ elif modo == "Comparación Múltiple":
         # Tabla comparativa
         st.subheader("📊 Tabla Comparativa de Resultados")
         
-        tabla_datos = []
-        for nombre, metricas in st.session_state.metricas_todas_cache.items():
-            tabla_datos.append({
-                'Escenario': nombre,
-                'Nutrientes Final (mg/L)': f"{metricas['nutrientes_final']:.4f}",
-                'Reducción Nutrientes (%)': f"{metricas['reduccion_nutrientes_pct']:.1f}",
-                'Lemna Final (ton)': f"{metricas['lemna_final']:.0f}",
-                'Cambio Lemna (%)': f"{-metricas['reduccion_lemna_pct']:.1f}",
-                'Oxígeno Final (mg/L)': f"{metricas['oxigeno_final']:.2f}",
-                'Mejora Oxígeno (%)': f"{metricas['mejora_oxigeno_pct']:.1f}"
-            })
-        
-        df_tabla = pd.DataFrame(tabla_datos)
-        st.dataframe(df_tabla, use_container_width=True, hide_index=True)
+        # La tabla se vuelca de una vez desde las métricas numéricas
+        # (from_records) y el redondeo se aplica solo al mostrar (Styler),
+        # en lugar de formatear cada celda con f-strings fila a fila.
+        metricas_todas = st.session_state.metricas_todas_cache
+        columnas = {
+            'nutrientes_final': 'Nutrientes Final (mg/L)',
+            'reduccion_nutrientes_pct': 'Reducción Nutrientes (%)',
+            'lemna_final': 'Lemna Final (ton)',
+            'reduccion_lemna_pct': 'Cambio Lemna (%)',
+            'oxigeno_final': 'Oxígeno Final (mg/L)',
+            'mejora_oxigeno_pct': 'Mejora Oxígeno (%)'
+        }
+        df_tabla = pd.DataFrame.from_records(list(metricas_todas.values()))
+        df_tabla = df_tabla[list(columnas)].rename(columns=columnas)
+        df_tabla['Cambio Lemna (%)'] *= -1
+        df_tabla.insert(0, 'Escenario', list(metricas_todas.keys()))
+        st.dataframe(df_tabla.style.format({
+            'Nutrientes Final (mg/L)': '{:.4f}',
+            'Reducción Nutrientes (%)': '{:.1f}',
+            'Lemna Final (ton)': '{:.0f}',
+            'Cambio Lemna (%)': '{:.1f}',
+            'Oxígeno Final (mg/L)': '{:.2f}',
+            'Mejora Oxígeno (%)': '{:.1f}'
+        }), use_container_width=True, hide_index=True)
         
         st.markdown("---")
         
         # Gráficos comparativos
         st.subheader("📈 Evolución Temporal Comparativa")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'nutrientes',
-                'Nutrientes', 'mg/L'), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'lemna',
-                'Biomasa de Lemna', 'toneladas'), use_container_width=True)
-        
-        with col2:
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'oxigeno',
-                'Oxígeno Disuelto', 'mg/L', mostrar_critico=True), use_container_width=True)
-            st.plotly_chart(crear_grafico_variable(
-                st.session_state.resultados_cache, 'volumen',
-                'Volumen del Lago', 'm³'), use_container_width=True)
+
+        st.plotly_chart(crear_grid_variables(st.session_state.resultados_cache),
+                        use_container_width=True, config=_PLOTLY_CONFIG)
 
 
 # Footer
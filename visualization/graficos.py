@@ -2,13 +2,27 @@
 Módulo de visualización para el modelo del Lago Titicaca.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from matplotlib.gridspec import GridSpec
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+_plt = None
+
+
+def _pyplot():
+    """Import diferido de matplotlib con el estilo aplicado una sola vez.
+
+    Quien solo necesita la figura de Plotly (p. ej. el dashboard) no paga
+    los cientos de ms del arranque de matplotlib.
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-v0_8-darkgrid')
+        _plt = plt
+    return _plt
+
 
 class GraficadorTiticaca:
     """
@@ -24,9 +38,15 @@ class GraficadorTiticaca:
         """
         self.runner = runner
         self.resultados = runner.resultados
-        
-        # Configuración de estilo
-        plt.style.use('seaborn-v0_8-darkgrid')
+
+        # Volumen en km³ precalculado una vez por escenario; las figuras
+        # de matplotlib y Plotly lo reutilizan en vez de repetir la
+        # división por 1e9 (y su array temporal) en cada trazado
+        self._volumen_km3 = {nombre: resultado['volumen'] / 1e9
+                             for nombre, resultado in self.resultados.items()}
+
+        # Configuración de estilo (el estilo de matplotlib se aplica en
+        # _pyplot, al primer uso real)
         self.figsize = (14, 10)
     
     def grafico_evolucion_temporal(self, guardar=False, archivo='evolucion_temporal.png'):
@@ -38,7 +58,9 @@ class GraficadorTiticaca:
             archivo (str): Nombre del archivo
         """
         from config.escenarios import ESCENARIOS
-        
+        from matplotlib.gridspec import GridSpec
+
+        plt = _pyplot()
         fig = plt.figure(figsize=self.figsize)
         gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
         
@@ -48,21 +70,25 @@ class GraficadorTiticaca:
         ax3 = fig.add_subplot(gs[1, 0])  # Oxígeno
         ax4 = fig.add_subplot(gs[1, 1])  # Volumen
         
-        # Graficar cada escenario
-        for nombre, resultado in self.resultados.items():
-            escenario = ESCENARIOS[nombre]
-            tiempo = resultado['tiempo']
-            color = escenario['color']
-            label = escenario['nombre']
-            
-            ax1.plot(tiempo, resultado['nutrientes'], color=color, 
-                    label=label, linewidth=2)
-            ax2.plot(tiempo, resultado['lemna'], color=color, 
-                    label=label, linewidth=2)
-            ax3.plot(tiempo, resultado['oxigeno'], color=color, 
-                    label=label, linewidth=2)
-            ax4.plot(tiempo, resultado['volumen']/1e9, color=color, 
-                    label=label, linewidth=2)
+        # Graficar todos los escenarios de una vez: matplotlib acepta una
+        # matriz 2D y traza una línea por columna en una sola llamada,
+        # en lugar de cuatro ax.plot por escenario
+        nombres = list(self.resultados)
+        resultados = [self.resultados[n] for n in nombres]
+        tiempo = resultados[0]['tiempo']
+        colores = [ESCENARIOS[n]['color'] for n in nombres]
+        etiquetas = [ESCENARIOS[n]['nombre'] for n in nombres]
+
+        bloques = [
+            (ax1, np.column_stack([r['nutrientes'] for r in resultados])),
+            (ax2, np.column_stack([r['lemna'] for r in resultados])),
+            (ax3, np.column_stack([r['oxigeno'] for r in resultados])),
+            (ax4, np.column_stack([self._volumen_km3[n] for n in nombres]))
+        ]
+        for ax, Y in bloques:
+            ax.set_prop_cycle(color=colores)
+            for linea, etiqueta in zip(ax.plot(tiempo, Y, linewidth=2), etiquetas):
+                linea.set_label(etiqueta)
         
         # Configurar subgráficos
         ax1.set_title('Concentración de Nutrientes', fontsize=12, fontweight='bold')
@@ -109,15 +135,18 @@ class GraficadorTiticaca:
             archivo (str): Nombre del archivo
         """
         from config.escenarios import ESCENARIOS
-        
+
+        plt = _pyplot()
         metricas = self.runner.metricas
         
-        # Preparar datos
-        escenarios_nombres = [ESCENARIOS[k]['nombre'] for k in metricas.keys()]
-        nutrientes_final = [v['nutrientes_final'] for v in metricas.values()]
-        lemna_final = [v['lemna_final'] for v in metricas.values()]
-        oxigeno_final = [v['oxigeno_final'] for v in metricas.values()]
-        colores = [ESCENARIOS[k]['color'] for k in metricas.keys()]
+        # Preparar datos: una sola pasada sobre las métricas vía DataFrame
+        # en lugar de tres comprensiones separadas sobre el mismo dict
+        df_m = pd.DataFrame.from_dict(metricas, orient='index')
+        nutrientes_final = df_m['nutrientes_final'].to_numpy()
+        lemna_final = df_m['lemna_final'].to_numpy()
+        oxigeno_final = df_m['oxigeno_final'].to_numpy()
+        escenarios_nombres = [ESCENARIOS[k]['nombre'] for k in metricas]
+        colores = [ESCENARIOS[k]['color'] for k in metricas]
         
         # Crear figura
         fig, axes = plt.subplots(1, 3, figsize=(16, 5))
@@ -183,53 +212,42 @@ class GraficadorTiticaca:
             horizontal_spacing=0.1
         )
         
-        # Añadir trazas para cada escenario
+        # Añadir trazas para cada escenario. Scattergl renderiza por WebGL
+        # en vez de SVG, y el cast a float32 reduce a la mitad el payload
+        # que Plotly serializa hacia el HTML; el modelo sigue en float64.
+        # Las trazas se acumulan y se agregan en un solo add_traces: una
+        # pasada de validación de Plotly en lugar de una por traza.
+        trazas, filas, columnas = [], [], []
         for nombre, resultado in self.resultados.items():
             escenario = ESCENARIOS[nombre]
-            tiempo = resultado['tiempo']
+            tiempo = np.asarray(resultado['tiempo'], dtype=np.float32)
             color = escenario['color']
             label = escenario['nombre']
-            
-            # Nutrientes
-            fig.add_trace(
-                go.Scatter(x=tiempo, y=resultado['nutrientes'], 
-                          name=label, line=dict(color=color, width=2),
-                          legendgroup=label, showlegend=True),
-                row=1, col=1
-            )
-            
-            # Lemna
-            fig.add_trace(
-                go.Scatter(x=tiempo, y=resultado['lemna'], 
-                          name=label, line=dict(color=color, width=2),
-                          legendgroup=label, showlegend=False),
-                row=1, col=2
-            )
-            
-            # Oxígeno
-            fig.add_trace(
-                go.Scatter(x=tiempo, y=resultado['oxigeno'], 
-                          name=label, line=dict(color=color, width=2),
-                          legendgroup=label, showlegend=False),
-                row=2, col=1
-            )
-            
-            # Volumen
-            fig.add_trace(
-                go.Scatter(x=tiempo, y=resultado['volumen']/1e9, 
-                          name=label, line=dict(color=color, width=2),
-                          legendgroup=label, showlegend=False),
-                row=2, col=2
-            )
-        
+
+            # Nutrientes, Lemna, Oxígeno y Volumen con su celda en la grilla
+            series = [
+                (resultado['nutrientes'], 1, 1, True),
+                (resultado['lemna'], 1, 2, False),
+                (resultado['oxigeno'], 2, 1, False),
+                (self._volumen_km3[nombre], 2, 2, False)
+            ]
+            for datos, fila, col, leyenda in series:
+                trazas.append(go.Scattergl(
+                    x=tiempo, y=np.asarray(datos, dtype=np.float32),
+                    name=label, line=dict(color=color, width=2),
+                    legendgroup=label, showlegend=leyenda))
+                filas.append(fila)
+                columnas.append(col)
+
         # Línea crítica de oxígeno
         tiempo_max = max([r['tiempo'][-1] for r in self.resultados.values()])
-        fig.add_trace(
-            go.Scatter(x=[0, tiempo_max], y=[6, 6],
+        trazas.append(go.Scattergl(x=[0, tiempo_max], y=[6, 6],
                       name='Nivel Crítico O₂',
-                      line=dict(color='red', dash='dash', width=2)),
-            row=2, col=1
-        )
+                      line=dict(color='red', dash='dash', width=2)))
+        filas.append(2)
+        columnas.append(1)
+
+        fig.add_traces(trazas, rows=filas, cols=columnas)
         
         # Actualizar ejes
         fig.update_xaxes(title_text="Tiempo (años)", row=2, col=1)
@@ -255,25 +273,29 @@ class GraficadorTiticaca:
             directorio (str): Directorio donde guardar los gráficos
         """
         import os
-        
+
+        plt = _pyplot()
         os.makedirs(directorio, exist_ok=True)
         
         # print("\nGenerando gráficos...")
         
+        # Cada figura se cierra apenas se guarda, para no mantener las dos
+        # figuras grandes de matplotlib vivas a la vez en memoria
+
         # Gráfico de evolución temporal
-        self.grafico_evolucion_temporal(guardar=True, 
+        fig = self.grafico_evolucion_temporal(guardar=True,
                                        archivo=f'{directorio}/evolucion_temporal.png')
-        
+        plt.close(fig)
+
         # Gráfico comparativo final
-        self.grafico_comparativo_final(guardar=True, 
+        fig = self.grafico_comparativo_final(guardar=True,
                                        archivo=f'{directorio}/comparativo_final.png')
-        
+        plt.close(fig)
+
         # Gráfico interactivo (guardar como HTML)
         fig_plotly = self.grafico_interactivo_plotly()
         fig_plotly.write_html(f'{directorio}/dashboard_interactivo.html')
         # print(f"✓ Dashboard interactivo: {directorio}/dashboard_interactivo.html")
-        
+
         # print(f"\nTodos los gráficos guardados en: {directorio}/")
-        
-        plt.close('all')
         
\ No newline at end of file